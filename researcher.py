@@ -38,7 +38,7 @@ class ResearcherHH:
 
     def update(self, **kwargs):
         self.settings.update_params(**kwargs)
-        if not any(self.settings.rates.values()) or self.settings.update:
+        if not (self.exchanger.is_fresh() and self.exchanger.load_rates(self.settings.rates)):
             print("[INFO]: Trying to get exchange rates from remote server...")
             self.exchanger.update_exchange_rates(self.settings.rates)
             self.exchanger.save_rates(self.settings.rates)
@@ -64,5 +64,7 @@ class ResearcherHH:
 
 if __name__ == "__main__":
     hh_analyzer = ResearcherHH()
+    if hh_analyzer.settings.gui:
+        hh_analyzer.gui.run()
     hh_analyzer.update()
     hh_analyzer()
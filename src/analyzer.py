@@ -2,7 +2,7 @@ r"""Researcher: collect statistics, predict salaries etc.
 """
 
 import re
-from typing import Dict, List
+from typing import List
 
 import matplotlib.pyplot as plt
 import nltk
@@ -88,18 +88,16 @@ class Analyzer:
         # Pandas series
         return pd.Series(dict(sorted(words_cnt.items(), key=lambda x: x[1], reverse=True)))
 
-    def prepare_df(self, vacancies: Dict) -> pd.DataFrame:
+    def prepare_df(self, df: pd.DataFrame) -> pd.DataFrame:
         """Prepare data frame and save results
 
         Parameters
         ----------
-        vacancies: dict
-            Dict of parsed vacancies.
+        df: pd.DataFrame
+            Data frame of parsed vacancies from DataCollector.
 
         """
 
-        # Create pandas dataframe
-        df = pd.DataFrame.from_dict(vacancies)
         # Print some info from data frame
         with pd.option_context("display.max_rows", None, "display.max_columns", None):
             print(df[df["Salary"]][["Employer", "From", "To", "Experience"]][0:15])
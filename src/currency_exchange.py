@@ -26,16 +26,48 @@ OR CORRECTION.
 ------------------------------------------------------------------------
 """
 import json
-from typing import Dict
+import os
+import time
+from typing import Dict, Optional
 
 import requests
 
+RATES_TTL = 24 * 60 * 60
+
 
 class Exchanger:
     __EXCHANGE_URL = "https://api.exchangerate-api.com/v4/latest/RUB"
 
-    def __init__(self, config_path: str):
+    def __init__(self, config_path: str, rates_cache_path: Optional[str] = None):
         self.config_path = config_path
+        # Every config has own rates cache next to it: settings.json -> settings.rates.json
+        self.rates_cache_path = rates_cache_path or os.path.splitext(config_path)[0] + ".rates.json"
+
+    def is_fresh(self) -> bool:
+        """Check if cached rates are updated less than RATES_TTL seconds ago."""
+        try:
+            return time.time() - os.path.getmtime(self.rates_cache_path) < RATES_TTL
+        except OSError:
+            return False
+
+    def load_rates(self, rates: Dict) -> bool:
+        """Load cached rates to `rates`. Only currencies from `rates` are loaded.
+
+        Returns
+        -------
+        bool
+            False if the cache can't be read or has no rate for some currency from `rates`,
+            rates should be updated from remote server.
+        """
+        try:
+            with open(self.rates_cache_path, "r") as cache:
+                cached = json.load(cache)
+        except (OSError, json.JSONDecodeError):
+            return False
+        if not all(cached.get(k) for k in rates):
+            return False
+        rates.update((k, cached[k]) for k in rates)
+        return True
 
     def update_exchange_rates(self, rates: Dict):
         """Parse exchange rates for RUB, USD, EUR and save them to `rates`
@@ -53,13 +85,14 @@ class Exchanger:
             raise AssertionError("[FAIL] Cannot get exchange rate! Try later or change the host API")
 
         for curr in rates:
-            rates[curr] = new_rates[curr]
+            rates[curr] = new_rates["RUB" if curr == "RUR" else curr]
 
         # Change 'RUB' to 'RUR'
-        rates["RUR"] = rates.pop("RUB")
+        if "RUB" in rates:
+            rates["RUR"] = rates.pop("RUB")
 
     def save_rates(self, rates: Dict):
-        """Save rates to JSON config."""
+        """Save rates to JSON config and rates cache."""
 
         with open(self.config_path, "r") as cfg:
             data = json.load(cfg)
@@ -69,6 +102,12 @@ class Exchanger:
         with open(self.config_path, "w") as cfg:
             json.dump(data, cfg, indent=2)
 
+        # Write to temporary file first, so interrupted dump doesn't break the cache
+        tmp_path = self.rates_cache_path + ".tmp"
+        with open(tmp_path, "w") as cache:
+            json.dump(rates, cache, indent=2)
+        os.replace(tmp_path, self.rates_cache_path)
+
 
 if __name__ == "__main__":
     _exchanger = Exchanger("../settings.json")
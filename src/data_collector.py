@@ -5,14 +5,25 @@ import hashlib
 import os
 import pickle
 import re
-from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, Optional
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 from urllib.parse import urlencode
 
+import numpy as np
+import orjson
+import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
+from urllib3.util.retry import Retry
 
 CACHE_DIR = os.path.join(os.path.abspath(os.path.dirname(__file__)), "cache")
+CACHE_TTL = 24 * 60 * 60
+TAG_PATTERN = re.compile(r"<[^>]*>")
+
+os.makedirs(CACHE_DIR, exist_ok=True)
 
 
 class DataCollector:
@@ -25,6 +36,10 @@ class DataCollector:
 
     """
     __API_BASE_URL = "https://api.hh.ru/vacancies/"
+    __MAX_PER_PAGE = 100
+    __POOL_SIZE = 256
+    __TIMEOUT = 10
+    __GROSS = {True: 0.87, False: 1.0}
     __DICT_KEYS = (
         "Ids",
         "Employer",
@@ -39,7 +54,15 @@ class DataCollector:
     )
 
     def __init__(self, exchange_rates: Optional[Dict]):
-        self._rates = exchange_rates
+        # Multiply by inverse rates instead of division for every salary
+        self._inv_rates = {k: 1.0 / v for k, v in (exchange_rates or {}).items() if v}
+
+        # Keep-alive connections are shared between all requests and threads
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+        self._session = requests.Session()
+        self._session.mount(
+            "https://", HTTPAdapter(pool_connections=1, pool_maxsize=self.__POOL_SIZE, max_retries=retries)
+        )
 
     @staticmethod
     def clean_tags(html_text: str) -> str:
@@ -56,107 +79,290 @@ class DataCollector:
             Clean text without HTML tags
 
         """
-        pattern = re.compile("<.*?>")
-        return re.sub(pattern, "", html_text)
+        if "<" not in html_text:
+            return html_text
+        return TAG_PATTERN.sub("", html_text)
+
+    @classmethod
+    def clean_description_column(cls, vacancies: pd.DataFrame) -> pd.DataFrame:
+        """Remove HTML tags from descriptions of collected vacancies
+
+        Parameters
+        ----------
+        vacancies: pd.DataFrame
+            Data frame of collected vacancies. Modified in place.
+
+        Returns
+        -------
+        result: pd.DataFrame
+            The same data frame with clean `Description` column
+
+        """
+        vacancies["Description"] = vacancies["Description"].map(cls.clean_tags)
+        return vacancies
+
+    def _fetch_json(self, url: str, params: Optional[Dict] = None) -> Dict:
+        """Send GET request and decode JSON response
+
+        Parameters
+        ----------
+        url: str
+            Target URL.
+        params: dict
+            Query string parameters.
+
+        Returns
+        -------
+        result: dict
+            Decoded JSON payload
+
+        Raises
+        ------
+        AssertionError
+            If HH API responds with `errors`.
+
+        """
+        response = self._session.get(url, params=params, timeout=self.__TIMEOUT)
+        if not response.ok:
+            # HH API describes failed requests in `errors`, e.g. [{"type": "captcha_required"}]
+            try:
+                errors = orjson.loads(response.content)["errors"]
+            except (orjson.JSONDecodeError, KeyError, TypeError):
+                response.raise_for_status()
+            raise AssertionError(f"[FAIL] HH API returned errors: {errors}")
+        return orjson.loads(response.content)
+
+    def _convert_salaries(self, result: Dict):
+        """Convert salaries of all vacancies to RUB in place.
+
+        Raw salary dicts from `Salary` column are converted with {Gross}
+        parameter and exchange rates in one vectorized pass. Then `From`
+        and `To` columns are filled and `Salary` is replaced by flags.
+
+        Parameters
+        ----------
+        result: dict
+            Dict of collected vacancy columns.
+
+        Raises
+        ------
+        AssertionError
+            If some currency has no exchange rate (missing, None or 0).
+
+        """
+        currencies = {cur: idx for idx, cur in enumerate(self._inv_rates)}
+        # The last rate is used for vacancies without salary
+        rate_vec = np.array([*self._inv_rates.values(), 1.0])
+        gross_vec = np.array([self.__GROSS[False], self.__GROSS[True]])
+
+        salaries = [salary or {} for salary in result["Salary"]]
+        unknown = {x["currency"] for x in salaries if x and x["currency"] not in currencies}
+        if unknown:
+            raise AssertionError(f"[FAIL] No exchange rates for currencies: {', '.join(sorted(unknown))}")
+        cur_idx = np.array([currencies[x["currency"]] if x else len(currencies) for x in salaries], dtype=int)
+        is_gross = np.array([bool(x.get("gross")) for x in salaries], dtype=int)
+        factor = rate_vec[cur_idx] * gross_vec[is_gross]
+
+        for key in ("From", "To"):
+            # Missing values are NaN here and None in result
+            values = np.trunc(np.array([x.get(key.lower()) for x in salaries], dtype=float) * factor)
+            missing = np.isnan(values)
+            column = np.where(missing, 0, values).astype(np.int64).astype(object)
+            column[missing] = None
+            result[key] = column.tolist()
+
+        result["Salary"] = [salary is not None for salary in result["Salary"]]
 
     @staticmethod
-    def __convert_gross(is_gross: bool) -> float:
-        return 0.87 if is_gross else 1
+    def get_vacancy_from_item(item: Dict) -> Tuple:
+        """Create vacancy tuple from the search page item without extra requests.
+
+        Search items have no key skills and full description, so the vacancy
+        snippet is used as a description.
+
+        Parameters
+        ----------
+        item: dict
+            Vacancy item from `items` of the search page.
+
+        Returns
+        -------
+        result: tuple
+            Vacancy tuple in the same format as `get_vacancy` returns
+
+        """
+        salary = item.get("salary")
+        snippet = item.get("snippet") or {}
+        description = " ".join(filter(None, (snippet.get("requirement"), snippet.get("responsibility"))))
+
+        # Raw salary is converted later in `_convert_salaries`
+        return (
+            item["id"],
+            item["employer"]["name"],
+            item["name"],
+            salary,
+            None,
+            None,
+            item["experience"]["name"],
+            item["schedule"]["name"],
+            [],
+            description,
+        )
 
     def get_vacancy(self, vacancy_id: str):
         # Get data from URL
         url = f"{self.__API_BASE_URL}{vacancy_id}"
-        vacancy = requests.api.get(url).json()
+        vacancy = self._fetch_json(url)
 
         # Extract salary
         salary = vacancy.get("salary")
 
-        # Calculate salary:
-        # Get salary into {RUB, USD, EUR} with {Gross} parameter and
-        # return a new salary in RUB.
-        from_to = {"from": None, "to": None}
-        if salary:
-            is_gross = vacancy["salary"].get("gross")
-            for k, v in from_to.items():
-                if vacancy["salary"][k] is not None:
-                    _value = self.__convert_gross(is_gross)
-                    from_to[k] = int(_value * salary[k] / self._rates[salary["currency"]])
-
-        # Create pages tuple
+        # Create pages tuple. Raw salary is converted later in `_convert_salaries`
         return (
             vacancy_id,
             vacancy["employer"]["name"],
             vacancy["name"],
-            salary is not None,
-            from_to["from"],
-            from_to["to"],
+            salary,
+            None,
+            None,
             vacancy["experience"]["name"],
             vacancy["schedule"]["name"],
             [el["name"] for el in vacancy["key_skills"]],
-            self.clean_tags(vacancy["description"]),
+            vacancy["description"],
         )
 
-    def collect_vacancies(self, query: Optional[Dict], refresh: bool = False, max_workers: int = 1) -> Dict:
+    def iter_vacancies(self, executor: Executor, ids: Iterable[str], window: int) -> Iterator[Tuple[int, Tuple]]:
+        """Get vacancies in order of completion
+
+        Only `window` requests are submitted at once, next ID is submitted
+        as soon as any request is done.
+
+        Parameters
+        ----------
+        executor: Executor
+            Executor for requests.
+        ids: iterable
+            Vacancy IDs.
+        window: int
+            Max number of submitted requests.
+
+        Yields
+        ------
+        position: int
+            Position of the vacancy ID in `ids`.
+        vacancy: tuple
+            Vacancy tuple from `get_vacancy`
+
+        """
+        ids = enumerate(ids)
+        pending = {executor.submit(self.get_vacancy, x): pos for pos, x in islice(ids, window)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                position = pending.pop(future)
+                for pos, x in islice(ids, 1):
+                    pending[executor.submit(self.get_vacancy, x)] = pos
+                yield position, future.result()
+
+    def collect_vacancies(
+        self,
+        query: Optional[Dict],
+        refresh: bool = False,
+        max_workers: int = 1,
+        fetch_details: bool = True,
+        clean_description: bool = True,
+    ) -> pd.DataFrame:
         """Parse vacancy JSON: get vacancy name, salary, experience etc.
 
         Parameters
         ----------
         query : dict
-            Search query params for GET requests.
+            Search query params for GET requests. `per_page` is always set to 100.
         refresh :  bool
-            Refresh cached data
+            Refresh cached data. Data older than CACHE_TTL is always refreshed.
         max_workers :  int
             Number of workers for threading.
+        fetch_details :  bool
+            Request every vacancy to get key skills and full description.
+            Otherwise build vacancies from search pages only.
+        clean_description :  bool
+            Remove HTML tags from descriptions. Otherwise keep raw HTML,
+            it can be cleaned later with `clean_description_column`.
+            Clean and raw results are cached separately.
 
         Returns
         -------
-        dict
-            Dict of useful arguments from vacancies
+        pd.DataFrame
+            Data frame of useful arguments from vacancies: Ids, Employer,
+            Name etc. Analyzer takes it as is.
 
         """
 
+        # HH API gives at most 100 vacancies per page, use the largest page to make less requests.
+        # Note: HH API has no field filtering, `/vacancies/{id}` always returns the full vacancy.
+        query = {**query, "per_page": self.__MAX_PER_PAGE}
+
         # Get cached data if exists...
-        cache_name: str = query.get("text")
-        cache_hash = hashlib.md5(cache_name.encode()).hexdigest()
+        # Whole query is hashed, so different `area` or other options don't share cache
+        cache_name: str = urlencode(sorted(query.items()))
+        if not fetch_details:
+            cache_name += "/items"
+        if not clean_description:
+            cache_name += "/raw"
+        cache_hash = hashlib.blake2b(cache_name.encode(), digest_size=16).hexdigest()
         cache_file = os.path.join(CACHE_DIR, cache_hash)
         try:
-            if not refresh:
+            # Cache older than CACHE_TTL is refreshed
+            if not refresh and time.time() - os.path.getmtime(cache_file) < CACHE_TTL:
+                with open(cache_file, "rb") as cache:
+                    result = pickle.load(cache)
                 print(f"[INFO]: Get results from cache! Enable refresh option to update results.")
-                return pickle.load(open(cache_file, "rb"))
-        except (FileNotFoundError, pickle.UnpicklingError):
+                return result
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
             pass
 
-        # Check number of pages...
-        target_url = self.__API_BASE_URL + "?" + urlencode(query)
-        num_pages = requests.get(target_url).json()["pages"]
+        # Get the first page and number of pages...
+        data = self._fetch_json(self.__API_BASE_URL, query)
+        num_pages = data["pages"]
+        items = list(data["items"])
 
-        # Collect vacancy IDs...
-        ids = []
-        for idx in range(num_pages + 1):
-            response = requests.get(target_url, {"page": idx})
-            data = response.json()
-            if "items" not in data:
+        # Collect vacancy items from the rest pages...
+        for idx in range(1, num_pages):
+            data = self._fetch_json(self.__API_BASE_URL, {**query, "page": idx})
+            if not data.get("items"):
                 break
-            ids.extend(x["id"] for x in data["items"])
+            items.extend(data["items"])
 
-        # Collect vacancies...
-        jobs_list = []
+        # Collect vacancies column by column, rows keep the order of search results...
+        result = {key: [None] * len(items) for key in self.__DICT_KEYS}
+        columns = tuple(result.values())
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            for vacancy in tqdm(
-                executor.map(self.get_vacancy, ids),
-                desc="Get data via HH API",
-                ncols=100,
-                total=len(ids),
-            ):
-                jobs_list.append(vacancy)
+            if fetch_details:
+                vacancies = tqdm(
+                    self.iter_vacancies(executor, (x["id"] for x in items), window=2 * max_workers),
+                    desc="Get data via HH API",
+                    ncols=100,
+                    total=len(items),
+                )
+            else:
+                vacancies = enumerate(map(self.get_vacancy_from_item, items))
 
-        unzipped_list = list(zip(*jobs_list))
+            for position, vacancy in vacancies:
+                for column, value in zip(columns, vacancy):
+                    column[position] = value
 
-        result = {}
-        for idx, key in enumerate(self.__DICT_KEYS):
-            result[key] = unzipped_list[idx]
+        self._convert_salaries(result)
+        result = pd.DataFrame(result, copy=False)
+        if clean_description:
+            self.clean_description_column(result)
 
-        pickle.dump(result, open(cache_file, "wb"))
+        # Write to temporary file first, so interrupted dump doesn't break the cache.
+        # Empty search is not cached, it would be served until CACHE_TTL expires.
+        if num_pages:
+            tmp_file = cache_file + ".tmp"
+            with open(tmp_file, "wb") as cache:
+                pickle.dump(result, cache, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
         return result
 
 
@@ -164,7 +370,7 @@ if __name__ == "__main__":
     dc = DataCollector(exchange_rates={"USD": 0.01264, "EUR": 0.01083, "RUR": 1.00000})
 
     vacancies = dc.collect_vacancies(
-        query={"text": "FPGA", "area": 1, "per_page": 50},
+        query={"text": "FPGA", "area": 1, "per_page": 100},
         # refresh=True
     )
     print(vacancies["Employer"])
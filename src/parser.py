@@ -3,6 +3,7 @@ r"""Parse command line arguments
 Command parameters:
     refresh         : bool  - Refresh data from remote server.
     max_workers     : int   - Number of workers for threading.
+    gui             : bool  - Run graphical user interface.
     options         : dict  - Options for GET request to hh api.
 
 Example:
@@ -10,7 +11,7 @@ Example:
         {
             "text": "Python Developer",
             "area": 1,
-            "per_page": 50
+            "per_page": 100
         }
 
 Parser parameters:
@@ -19,8 +20,46 @@ Parser parameters:
 """
 
 import argparse
+import copy
 import json
-from typing import Dict, Optional, Sequence
+import os
+import sys
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+
+@lru_cache(maxsize=8)
+def _load_config(config_path: str, mtime_ns: int, size: int) -> Dict:
+    """Read JSON config. Cached by file path, modification time and size."""
+    with open(config_path, "r") as cfg:
+        return json.load(cfg)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Create parser of command line arguments."""
+    parser = argparse.ArgumentParser(description="HeadHunter vacancies researcher")
+    parser.add_argument(
+        "--text", action="store", type=str, default=None, help='Search query text (e.g. "Machine learning")',
+    )
+    parser.add_argument(
+        "--max_workers", action="store", type=int, default=None, help="Number of workers for multithreading.",
+    )
+    parser.add_argument(
+        "--refresh", help="Refresh cached data from HH API", action="store_true", default=None,
+    )
+    parser.add_argument(
+        "--save_result", help="Save parsed result as DataFrame to CSV file.", action="store_true", default=None,
+    )
+    parser.add_argument(
+        "--gui", help="Run graphical user interface.", action="store_true", default=None,
+    )
+    parser.add_argument(
+        "--update", action="store_true", default=None, help="Save command line args to file in JSON format.",
+    )
+    return parser
+
+
+_PARSER = _build_parser()
 
 
 class Settings:
@@ -47,6 +86,8 @@ class Settings:
         Number of workers for threading.
     rates : dict
         Dict of currencies. For example: {"RUB": 1, "USD": 0.001}
+    gui : bool
+        Run graphical user interface.
     """
 
     def __init__(
@@ -58,13 +99,14 @@ class Settings:
         self.max_workers: int = 1
         self.save_result: bool = False
         self.update: bool = False
+        self.gui: bool = False
 
         # Get config from file
-        with open(config_path, "r") as cfg:
-            config: Dict = json.load(cfg)
+        stat = os.stat(config_path)
+        config: Dict = copy.deepcopy(_load_config(config_path, stat.st_mtime_ns, stat.st_size))
 
         if not no_parse:
-            params = self.__parse_args(input_args)
+            params = self.__parse_args(tuple(sys.argv[1:] if input_args is None else input_args))
 
             for key, value in params.items():
                 if value is not None:
@@ -74,6 +116,7 @@ class Settings:
                         config["options"][key] = value
 
             self.update = params.get("update", False)
+            self.gui = params.get("gui") or False
             if params["update"]:
                 with open(config_path, "w") as cfg:
                     json.dump(config, cfg, indent=2)
@@ -94,8 +137,9 @@ class Settings:
                 setattr(self, key, value)
 
     @staticmethod
-    def __parse_args(inputs_args) -> Dict:
-        """Read arguments from command line.
+    @lru_cache(maxsize=8)
+    def __parse_args(inputs_args: Tuple[str, ...]) -> Dict:
+        """Read arguments from command line. Cached by arguments.
 
         Returns
         -------
@@ -104,24 +148,7 @@ class Settings:
 
         """
 
-        parser = argparse.ArgumentParser(description="HeadHunter vacancies researcher")
-        parser.add_argument(
-            "--text", action="store", type=str, default=None, help='Search query text (e.g. "Machine learning")',
-        )
-        parser.add_argument(
-            "--max_workers", action="store", type=int, default=None, help="Number of workers for multithreading.",
-        )
-        parser.add_argument(
-            "--refresh", help="Refresh cached data from HH API", action="store_true", default=None,
-        )
-        parser.add_argument(
-            "--save_result", help="Save parsed result as DataFrame to CSV file.", action="store_true", default=None,
-        )
-        parser.add_argument(
-            "--update", action="store_true", default=None, help="Save command line args to file in JSON format.",
-        )
-
-        params, unknown = parser.parse_known_args(inputs_args)
+        params, unknown = _PARSER.parse_known_args(inputs_args)
         # Update config from command line
         return vars(params)
 
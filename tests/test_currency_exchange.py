@@ -0,0 +1,58 @@
+import json
+import os
+import time
+
+import pytest
+import requests
+from src.currency_exchange import RATES_TTL, Exchanger
+
+
+@pytest.fixture
+def exchanger(tmp_path):
+    config_path = tmp_path / "settings.json"
+    config_path.write_text(json.dumps({"rates": {}}))
+    return Exchanger(str(config_path))
+
+
+def test_update_maps_rur_to_rub(exchanger, monkeypatch):
+    class Response:
+        @staticmethod
+        def json():
+            return {"rates": {"RUB": 1, "USD": 0.01, "EUR": 0.02}}
+
+    monkeypatch.setattr(requests, "get", lambda url: Response())
+    rates = {"USD": None, "EUR": None, "RUR": None}
+    exchanger.update_exchange_rates(rates)
+    assert rates == {"USD": 0.01, "EUR": 0.02, "RUR": 1}
+
+
+def test_save_and_load_rates(exchanger):
+    exchanger.save_rates({"USD": 0.01, "RUR": 1})
+    assert exchanger.is_fresh()
+
+    rates = {"USD": None}
+    assert exchanger.load_rates(rates)
+    assert rates == {"USD": 0.01}
+
+
+def test_load_rates_missing_currency(exchanger):
+    exchanger.save_rates({"USD": 0.01, "KZT": None, "RUR": 1})
+    for rates in ({"USD": None, "EUR": 0.02}, {"KZT": None}):
+        before = dict(rates)
+        assert not exchanger.load_rates(rates)
+        assert rates == before
+
+
+def test_load_rates_broken_cache(exchanger):
+    assert not exchanger.load_rates({"USD": None})
+    with open(exchanger.rates_cache_path, "w") as cache:
+        cache.write("")
+    assert exchanger.is_fresh()
+    assert not exchanger.load_rates({"USD": None})
+
+
+def test_stale_cache(exchanger):
+    exchanger.save_rates({"USD": 0.01})
+    old = time.time() - RATES_TTL - 1
+    os.utime(exchanger.rates_cache_path, (old, old))
+    assert not exchanger.is_fresh()
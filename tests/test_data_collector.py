@@ -0,0 +1,128 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+from src.data_collector import DataCollector
+
+RATES = {"RUR": 1, "USD": 0.01, "EUR": 0.02}
+
+
+@pytest.fixture
+def collector():
+    return DataCollector(RATES)
+
+
+def _columns(*salaries):
+    return {"Salary": list(salaries), "From": [None] * len(salaries), "To": [None] * len(salaries)}
+
+
+def test_convert_gross_and_net(collector):
+    result = _columns(
+        {"from": 100, "to": 200, "currency": "USD", "gross": False},
+        {"from": 1000, "to": 2000, "currency": "RUR", "gross": True},
+    )
+    collector._convert_salaries(result)
+    assert result["From"] == [10000, 870]
+    assert result["To"] == [20000, 1740]
+    assert all(isinstance(x, int) for x in result["From"] + result["To"])
+
+
+def test_convert_missing_from_to(collector):
+    result = _columns(
+        {"from": None, "to": 100, "currency": "EUR", "gross": False},
+        {"from": 100, "to": None, "currency": "EUR", "gross": False},
+    )
+    collector._convert_salaries(result)
+    assert result["From"] == [None, 5000]
+    assert result["To"] == [5000, None]
+
+
+def test_convert_no_salary(collector):
+    result = _columns(None, {"from": 100, "to": None, "currency": "RUR", "gross": False})
+    collector._convert_salaries(result)
+    assert result["Salary"] == [False, True]
+    assert result["From"] == [None, 100]
+    assert result["To"] == [None, None]
+
+
+def test_convert_empty_batch(collector):
+    result = _columns()
+    collector._convert_salaries(result)
+    assert result == {"Salary": [], "From": [], "To": []}
+
+
+def test_convert_unknown_currency():
+    collector = DataCollector({"RUR": 1, "USD": None})
+    for currency in ("KZT", "USD"):
+        with pytest.raises(AssertionError, match=currency):
+            collector._convert_salaries(_columns({"from": 100, "to": None, "currency": currency, "gross": False}))
+
+
+def test_iter_vacancies_window(collector, monkeypatch):
+    lock = threading.Lock()
+    running = {"now": 0, "max": 0}
+
+    def get_vacancy(vacancy_id):
+        with lock:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+        time.sleep(0.01 * (int(vacancy_id) % 3 + 1))
+        with lock:
+            running["now"] -= 1
+        return (vacancy_id,)
+
+    monkeypatch.setattr(collector, "get_vacancy", get_vacancy)
+    ids = [str(x) for x in range(20)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        result = list(collector.iter_vacancies(executor, iter(ids), window=3))
+
+    assert sorted(result) == [(pos, (x,)) for pos, x in enumerate(ids)]
+    assert 1 < running["max"] <= 3
+
+
+def test_collect_vacancies_keeps_search_order(collector, monkeypatch, tmp_path):
+    ids = [str(x) for x in range(6)]
+
+    def fetch_json(url, params=None):
+        if url.endswith("/vacancies/"):
+            return {"pages": 1, "items": [{"id": x} for x in ids]}
+        vacancy_id = url.rsplit("/", 1)[1]
+        # Early vacancies are answered last
+        time.sleep(0.005 * (len(ids) - int(vacancy_id)))
+        return {
+            "name": vacancy_id,
+            "employer": {"name": "E"},
+            "salary": None,
+            "experience": {"name": "x"},
+            "schedule": {"name": "s"},
+            "key_skills": [],
+            "description": "<p>text</p>",
+        }
+
+    monkeypatch.setattr("src.data_collector.CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(collector, "_fetch_json", fetch_json)
+    df = collector.collect_vacancies({"text": "test"}, refresh=True, max_workers=3)
+    assert df["Ids"].tolist() == ids
+    assert df["Description"].tolist() == ["text"] * len(ids)
+
+
+
+def _mock_response(collector, monkeypatch, status_code, content):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    monkeypatch.setattr(collector._session, "get", lambda *args, **kwargs: response)
+
+
+def test_fetch_json_hh_errors(collector, monkeypatch):
+    _mock_response(collector, monkeypatch, 403, b'{"errors": [{"type": "captcha_required"}]}')
+    with pytest.raises(AssertionError, match="captcha_required"):
+        collector._fetch_json("https://api.hh.ru/vacancies/")
+
+
+def test_fetch_json_http_error(collector, monkeypatch):
+    _mock_response(collector, monkeypatch, 502, b"Bad Gateway")
+    with pytest.raises(requests.HTTPError):
+        collector._fetch_json("https://api.hh.ru/vacancies/")